@@ -2,10 +2,14 @@
 Configuration management for Hand Hockey Discord Bot
 """
 import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from the .env next to this file for local
+# development. Production sets them directly, so skip the import and file
+# read when there's no .env
+_DOTENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+if os.getenv('SKIP_DOTENV') != '1' and os.path.exists(_DOTENV_PATH):
+    from dotenv import load_dotenv
+    load_dotenv(_DOTENV_PATH)
 
 class Config:
     """Bot configuration settings"""
@@ -15,11 +19,23 @@ class Config:
     APPLICATION_ID = os.getenv('APPLICATION_ID')
     GUILD_ID = int(os.getenv('YOUR_GUILD_ID')) if os.getenv('YOUR_GUILD_ID') else None
     COMMAND_PREFIX = os.getenv('COMMAND_PREFIX', 'H')
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    # Sync slash commands automatically the first time the bot becomes ready
+    SYNC_ON_READY = os.getenv('SYNC_ON_READY', 'false').lower() == 'true'
     
     # Database Settings (PostgreSQL - Neon.com)
     DATABASE_URL = os.getenv('DATABASE_URL')
+    # Set when DATABASE_URL points at PgBouncer (transaction pooling), see deploy/pgbouncer.ini
+    DB_USE_PGBOUNCER = os.getenv('DB_USE_PGBOUNCER', 'false').lower() == 'true'
     DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 1))
-    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 50 if DB_USE_PGBOUNCER else 10))
+    DB_COMMAND_TIMEOUT = float(os.getenv('DB_COMMAND_TIMEOUT', 60))
+    DB_IDLE_TIMEOUT = float(os.getenv('DB_IDLE_TIMEOUT', 30))  # Seconds before idle pool connections are closed
+    DB_CONNECT_TIMEOUT = float(os.getenv('DB_CONNECT_TIMEOUT', 10))
+    DB_CACHE_TTL = float(os.getenv('DB_CACHE_TTL', 2))  # Seconds to reuse player/match reads
+    DB_CACHE_MAX_SIZE = int(os.getenv('DB_CACHE_MAX_SIZE', 1000))  # Max cached rows per table
+    DB_MAX_RETRIES = int(os.getenv('DB_MAX_RETRIES', 3))
+    DB_RETRY_MAX_WAIT = float(os.getenv('DB_RETRY_MAX_WAIT', 5))  # Cap on backoff between attempts
     
     # Game Settings
     MAX_PLAYERS_PER_MATCH = int(os.getenv('MAX_PLAYERS_PER_MATCH', 10))
@@ -36,8 +52,8 @@ class Config:
         ORANGE = 0xff6600
     
     # Game Roles
-    VALID_ROLES = ["ST", "MF", "DEF", "GK"]  # Striker, Midfielder, Defender, Goalkeeper
-    VALID_TEAMS = ["A", "B"]
+    VALID_ROLES = frozenset({"ST", "MF", "DEF", "GK"})  # Striker, Midfielder, Defender, Goalkeeper
+    VALID_TEAMS = frozenset({"A", "B"})
     
     @classmethod
     def validate(cls):
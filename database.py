@@ -5,42 +5,166 @@ Handles PostgreSQL connection and operations using Neon.com
 import asyncio
 import asyncpg
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import random
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 from config import Config
 import time
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the DDL in create_tables changes so existing databases pick it up
+SCHEMA_VERSION = 1
+
+# Columns update_player_stats / update_match_score may set
+PLAYER_STAT_COLUMNS = ('matches_played', 'matches_won', 'matches_lost', 'goals', 'assists',
+                       'saves', 'tackles', 'interceptions', 'hat_tricks', 'mvps', 'rating')
+MATCH_SCORE_COLUMNS = ('team_a_score', 'team_b_score', 'score_a', 'score_b',
+                       'shots_a', 'shots_b', 'saves_a', 'saves_b')
+
+# Columns the match list UI needs, the default for get_active_matches
+ACTIVE_MATCH_COLUMNS = ('match_id', 'host_id', 'channel_id', 'status', 'team_a_name', 'team_b_name',
+                        'team_a_score', 'team_b_score', 'created_at')
+MATCH_COLUMNS = frozenset(ACTIVE_MATCH_COLUMNS + MATCH_SCORE_COLUMNS + ('started_at', 'ended_at'))
+
+def _coalesce_update(table: str, columns: tuple, key_column: str, extra: str = "") -> str:
+    """Build a fixed UPDATE that leaves a column unchanged when its parameter is NULL"""
+    set_clauses = [f"{column} = COALESCE(${i}, {column})" for i, column in enumerate(columns, 1)]
+    if extra:
+        set_clauses.append(extra)
+    return f"UPDATE {table} SET {', '.join(set_clauses)} WHERE {key_column} = ${len(columns) + 1}"
+
+# Fixed statements on the hot command paths. Their text never changes, so new
+# pool connections prepare them up front into asyncpg's statement cache
+HOT_STATEMENTS = {
+    'get_player': "SELECT * FROM players WHERE user_id = $1",
+    'get_match': "SELECT * FROM matches WHERE match_id = $1",
+    'update_match_status': "UPDATE matches SET status = $1 WHERE match_id = $2",
+    'update_match_host': "UPDATE matches SET host_id = $1 WHERE match_id = $2",
+    'remove_player_from_match': "DELETE FROM match_players WHERE match_id = $1 AND user_id = $2",
+    'update_player_stats': _coalesce_update('players', PLAYER_STAT_COLUMNS, 'user_id',
+                                            extra="updated_at = CURRENT_TIMESTAMP"),
+    'update_match_score': _coalesce_update('matches', MATCH_SCORE_COLUMNS, 'match_id'),
+}
+
+class _RowCache:
+    """Short-lived cache of single rows, invalidated by every write to the same key
+    
+    Entries are kept in insertion order, which is also expiry order (fixed TTL).
+    Each write bumps a generation so a read that overlapped it doesn't put the
+    old row back after the write has invalidated it.
+    """
+    
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._rows: 'OrderedDict[Any, Tuple[asyncpg.Record, float]]' = OrderedDict()
+        self._generation = 0
+        self._floor = 0  # Reads that started before this generation may not cache
+        self._written: Dict[Any, int] = {}  # Last write generation per key
+    
+    def get(self, key) -> Optional[asyncpg.Record]:
+        """Return a cached row if it hasn't expired"""
+        entry = self._rows.get(key)
+        if entry is None:
+            return None
+        row, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._rows.pop(key, None)
+            return None
+        return row
+    
+    def read_token(self) -> int:
+        """Take before fetching a row, then hand to put()"""
+        return self._generation
+    
+    def put(self, key, row: asyncpg.Record, token: int):
+        """Cache a row fetched since token, unless the key was written meanwhile"""
+        if self.ttl <= 0 or token < self._floor or self._written.get(key, -1) > token:
+            return
+        now = time.monotonic()
+        self._rows.pop(key, None)  # Re-insert at the end so order keeps following expiry
+        self._rows[key] = (row, now + self.ttl)
+        
+        # Oldest entries are at the front: drop them while expired or over the size cap
+        while self._rows:
+            _, expires_at = next(iter(self._rows.values()))
+            if expires_at > now and len(self._rows) <= self.max_size:
+                break
+            self._rows.popitem(last=False)
+    
+    def invalidate(self, key):
+        """Drop a key after writing its row"""
+        self._rows.pop(key, None)
+        self._generation += 1
+        if len(self._written) >= self.max_size:
+            # Forget per-key history instead of growing; reads already in flight won't cache
+            self._written.clear()
+            self._floor = self._generation
+        self._written[key] = self._generation
+
 class DatabaseManager:
     """Manages PostgreSQL database connections and operations"""
     
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
         self.connection_url = Config.DATABASE_URL
+        
+        # Short-lived read caches, invalidated by every write to the same row
+        self._player_cache = _RowCache(Config.DB_CACHE_TTL, Config.DB_CACHE_MAX_SIZE)
+        self._match_cache = _RowCache(Config.DB_CACHE_TTL, Config.DB_CACHE_MAX_SIZE)
     
-    async def initialize(self, max_retries: int = 3):
+    async def initialize(self, max_retries: int = None):
         """Initialize database connection pool with retry logic"""
-        for attempt in range(max_retries):
+        max_retries = max(1, max_retries or Config.DB_MAX_RETRIES)
+        pool_kwargs = {}
+        if Config.DB_USE_PGBOUNCER:
+            # Transaction pooling hands each query to an arbitrary backend,
+            # so asyncpg's per-connection prepared statement cache can't be used
+            pool_kwargs['statement_cache_size'] = 0
+        else:
+            pool_kwargs['init'] = self._warm_connection
+        
+        for attempt in range(1, max_retries + 1):
             try:
                 self.pool = await asyncpg.create_pool(
                     self.connection_url,
-                    min_size=1,
-                    max_size=10,
-                    command_timeout=60
+                    min_size=Config.DB_POOL_MIN_SIZE,
+                    max_size=Config.DB_POOL_MAX_SIZE,
+                    command_timeout=Config.DB_COMMAND_TIMEOUT,
+                    max_inactive_connection_lifetime=Config.DB_IDLE_TIMEOUT,
+                    timeout=Config.DB_CONNECT_TIMEOUT,
+                    **pool_kwargs
                 )
                 logger.info("Database pool created successfully")
                 await self.create_tables()
                 return
             except Exception as e:
-                logger.error(f"Failed to initialize database (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    await asyncio.sleep(wait_time)
-                else:
+                logger.error(f"Failed to initialize database (attempt {attempt}/{max_retries}): {e}")
+                if self.pool:
+                    # Don't leak a pool whose schema setup failed
+                    await self.pool.close()
+                    self.pool = None
+                if attempt == max_retries:
                     logger.error("Max retries reached. Database initialization failed.")
                     raise
+                # Jittered exponential backoff, capped so transient blips recover quickly
+                wait_time = min(Config.DB_RETRY_MAX_WAIT, random.uniform(0.2, 0.2 * (2 ** attempt)))
+                logger.info(f"Retrying in {wait_time:.1f} seconds...")
+                await asyncio.sleep(wait_time)
+    
+    async def _warm_connection(self, conn: asyncpg.Connection):
+        """Prepare the hot statements on a new pool connection
+        
+        Running each one with NULL parameters matches no rows, but leaves it
+        parsed and planned in the connection's statement cache.
+        """
+        try:
+            for query in HOT_STATEMENTS.values():
+                await conn.execute(query, *([None] * len(set(re.findall(r'\$\d+', query)))))
+        except asyncpg.UndefinedTableError:
+            pass  # First start, create_tables hasn't run yet; statements get cached on first use
     
     async def close(self):
         """Close database connection pool"""
@@ -53,9 +177,10 @@ class DatabaseManager:
         if not self.pool:
             raise RuntimeError("Database pool not initialized")
         
-        async with self.pool.acquire() as conn:
+        # Every statement is idempotent so an outdated schema can simply re-run them
+        statements = [
             # Players table
-            await conn.execute("""
+            """
                 CREATE TABLE IF NOT EXISTS players (
                     user_id BIGINT PRIMARY KEY,
                     username VARCHAR(100) NOT NULL,
@@ -74,10 +199,10 @@ class DatabaseManager:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
-            """)
-            
+            """,
+        
             # Matches table
-            await conn.execute("""
+            """
                 CREATE TABLE IF NOT EXISTS matches (
                     match_id VARCHAR(50) PRIMARY KEY,
                     host_id BIGINT NOT NULL,
@@ -97,10 +222,10 @@ class DatabaseManager:
                     started_at TIMESTAMP,
                     ended_at TIMESTAMP
                 )
-            """)
-            
+            """,
+        
             # Match players table (many-to-many relationship)
-            await conn.execute("""
+            """
                 CREATE TABLE IF NOT EXISTS match_players (
                     id SERIAL PRIMARY KEY,
                     match_id VARCHAR(50) REFERENCES matches(match_id) ON DELETE CASCADE,
@@ -111,10 +236,10 @@ class DatabaseManager:
                     joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     UNIQUE(match_id, user_id)
                 )
-            """)
-            
+            """,
+        
             # Match events table
-            await conn.execute("""
+            """
                 CREATE TABLE IF NOT EXISTS match_events (
                     id SERIAL PRIMARY KEY,
                     match_id VARCHAR(50) REFERENCES matches(match_id) ON DELETE CASCADE,
@@ -126,19 +251,48 @@ class DatabaseManager:
                     minute INTEGER,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
-            """)
-            
+            """,
+        
             # Create indexes for better performance
-            await conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_host ON matches(host_id)")
-            await conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_status ON matches(status)")
-            await conn.execute("CREATE INDEX IF NOT EXISTS idx_match_players_match ON match_players(match_id)")
-            await conn.execute("CREATE INDEX IF NOT EXISTS idx_match_players_user ON match_players(user_id)")
-            await conn.execute("CREATE INDEX IF NOT EXISTS idx_match_events_match ON match_events(match_id)")
+            "CREATE INDEX IF NOT EXISTS idx_matches_host ON matches(host_id)",
+            "CREATE INDEX IF NOT EXISTS idx_matches_status ON matches(status)",
+            # Partial indexes over active matches only (most rows are finished)
+            """
+                CREATE INDEX IF NOT EXISTS idx_matches_host_active ON matches(host_id)
+                WHERE status IN ('waiting', 'ongoing')
+            """,
+            """
+                CREATE INDEX IF NOT EXISTS idx_matches_active_created ON matches(created_at DESC)
+                WHERE status IN ('waiting', 'ongoing')
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_match_players_match ON match_players(match_id)",
+            "CREATE INDEX IF NOT EXISTS idx_match_players_user ON match_players(user_id)",
+            "CREATE INDEX IF NOT EXISTS idx_match_events_match ON match_events(match_id)",
+            
+            # Schema version applied by the last successful create_tables
+            "CREATE TABLE IF NOT EXISTS schema_meta (version INTEGER PRIMARY KEY)",
+            "DELETE FROM schema_meta",
+            f"INSERT INTO schema_meta (version) VALUES ({SCHEMA_VERSION})",
+        ]
+        
+        async with self.pool.acquire() as conn:
+            try:
+                version = await conn.fetchval("SELECT max(version) FROM schema_meta")
+            except asyncpg.UndefinedTableError:
+                version = None
+            
+            if version is not None and version >= SCHEMA_VERSION:
+                logger.info(f"Database schema verified (version {version})")
+                return
+            
+            # Cold or outdated database: apply all DDL in one round-trip
+            async with conn.transaction():
+                await conn.execute(";\n".join(statements))
             
-            logger.info("Database tables created/verified successfully")
+            logger.info(f"Database tables created/updated to schema version {SCHEMA_VERSION}")
     
     # Player operations
-    async def create_or_update_player(self, user_id: int, username: str, display_name: str = None) -> Dict:
+    async def create_or_update_player(self, user_id: int, username: str, display_name: str = None) -> asyncpg.Record:
         """Create or update a player record"""
         async with self.pool.acquire() as conn:
             result = await conn.fetchrow("""
@@ -151,57 +305,50 @@ class DatabaseManager:
                     updated_at = CURRENT_TIMESTAMP
                 RETURNING *
             """, user_id, username, display_name or username)
-            return dict(result)
+            self._player_cache.invalidate(user_id)
+            return result
     
-    async def get_player(self, user_id: int) -> Optional[Dict]:
+    async def get_player(self, user_id: int) -> Optional[asyncpg.Record]:
         """Get player by user ID"""
         if not self.pool:
             logger.error("Database pool not initialized")
             return None
         
+        cached = self._player_cache.get(user_id)
+        if cached is not None:
+            return cached
+        
+        token = self._player_cache.read_token()
         try:
             async with self.pool.acquire() as conn:
-                result = await conn.fetchrow("SELECT * FROM players WHERE user_id = $1", user_id)
-                return dict(result) if result else None
+                result = await conn.fetchrow(HOT_STATEMENTS['get_player'], user_id)
+            if result:
+                self._player_cache.put(user_id, result, token)
+            return result
         except Exception as e:
             logger.error(f"Error fetching player {user_id}: {e}")
             return None
     
     async def update_player_stats(self, user_id: int, **stats) -> bool:
         """Update player statistics"""
-        if not stats:
-            return False
-            
-        set_clauses = []
+        # One positional value per column, None leaves the column unchanged
         values = []
-        param_count = 1
-        
-        for key, value in stats.items():
+        for column in PLAYER_STAT_COLUMNS:
+            value = stats.get(column)
             if hasattr(value, '__iter__') and not isinstance(value, str):
-                continue  # Skip iterables that aren't strings
-            set_clauses.append(f"{key} = ${param_count}")
+                value = None  # Skip iterables that aren't strings
             values.append(value)
-            param_count += 1
         
-        if not set_clauses:
+        if all(value is None for value in values):
             return False
         
-        set_clauses.append(f"updated_at = ${param_count}")
-        values.append(datetime.now())
-        values.append(user_id)  # For WHERE clause
-        
-        query = f"""
-            UPDATE players 
-            SET {', '.join(set_clauses)}
-            WHERE user_id = ${param_count + 1}
-        """
-        
         async with self.pool.acquire() as conn:
-            result = await conn.execute(query, *values)
+            result = await conn.execute(HOT_STATEMENTS['update_player_stats'], *values, user_id)
+            self._player_cache.invalidate(user_id)
             return result != "UPDATE 0"
     
     # Match operations
-    async def create_match(self, match_id: str, host_id: int, channel_id: int) -> Dict:
+    async def create_match(self, match_id: str, host_id: int, channel_id: int) -> asyncpg.Record:
         """Create a new match"""
         async with self.pool.acquire() as conn:
             result = await conn.fetchrow("""
@@ -209,33 +356,67 @@ class DatabaseManager:
                 VALUES ($1, $2, $3)
                 RETURNING *
             """, match_id, host_id, channel_id)
-            return dict(result)
+            self._match_cache.invalidate(match_id)
+            return result
+    
+    async def create_match_full(self, match_id: str, host_id: int, channel_id: int,
+                                team_a_name: str = None, team_b_name: str = None) -> asyncpg.Record:
+        """Create a new match and set its team names on one connection/transaction"""
+        async with self.pool.acquire() as conn, conn.transaction():
+            result = await conn.fetchrow("""
+                INSERT INTO matches (match_id, host_id, channel_id)
+                VALUES ($1, $2, $3)
+                RETURNING *
+            """, match_id, host_id, channel_id)
+            if team_a_name is not None or team_b_name is not None:
+                result = await conn.fetchrow("""
+                    UPDATE matches
+                    SET team_a_name = COALESCE($1, team_a_name),
+                        team_b_name = COALESCE($2, team_b_name)
+                    WHERE match_id = $3
+                    RETURNING *
+                """, team_a_name, team_b_name, match_id)
+            self._match_cache.invalidate(match_id)
+            return result
     
-    async def get_match(self, match_id: str) -> Optional[Dict]:
+    async def get_match(self, match_id: str) -> Optional[asyncpg.Record]:
         """Get match by ID"""
         if not self.pool:
             logger.error("Database pool not initialized")
             return None
         
+        cached = self._match_cache.get(match_id)
+        if cached is not None:
+            return cached
+        
+        token = self._match_cache.read_token()
         try:
             async with self.pool.acquire() as conn:
-                result = await conn.fetchrow("SELECT * FROM matches WHERE match_id = $1", match_id)
-                return dict(result) if result else None
+                result = await conn.fetchrow(HOT_STATEMENTS['get_match'], match_id)
+            if result:
+                self._match_cache.put(match_id, result, token)
+            return result
         except Exception as e:
             logger.error(f"Error fetching match {match_id}: {e}")
             return None
     
-    async def get_active_matches(self) -> List[Dict]:
-        """Get all active matches"""
+    async def get_active_matches(self, limit: int = 25, offset: int = 0,
+                                 columns: Tuple[str, ...] = ACTIVE_MATCH_COLUMNS) -> List[asyncpg.Record]:
+        """Get a page of active matches, newest first"""
+        unknown = set(columns) - MATCH_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown match columns: {', '.join(sorted(unknown))}")
+        
         async with self.pool.acquire() as conn:
-            results = await conn.fetch("""
-                SELECT * FROM matches 
+            results = await conn.fetch(f"""
+                SELECT {', '.join(columns)} FROM matches 
                 WHERE status IN ('waiting', 'ongoing')
                 ORDER BY created_at DESC
-            """)
-            return [dict(row) for row in results]
+                LIMIT $1 OFFSET $2
+            """, limit, offset)
+            return results
     
-    async def get_user_active_match(self, user_id: int) -> Optional[Dict]:
+    async def get_user_active_match(self, user_id: int) -> Optional[asyncpg.Record]:
         """Get user's active match (as host)"""
         async with self.pool.acquire() as conn:
             result = await conn.fetchrow("""
@@ -243,51 +424,68 @@ class DatabaseManager:
                 WHERE host_id = $1 AND status IN ('waiting', 'ongoing')
                 LIMIT 1
             """, user_id)
-            return dict(result) if result else None
+            return result
     
     async def delete_match(self, match_id: str) -> bool:
         """Delete a match"""
         async with self.pool.acquire() as conn:
             result = await conn.execute("DELETE FROM matches WHERE match_id = $1", match_id)
+            self._match_cache.invalidate(match_id)
             return result != "DELETE 0"
     
     async def update_match_status(self, match_id: str, status: str) -> bool:
         """Update match status"""
         async with self.pool.acquire() as conn:
-            result = await conn.execute("""
-                UPDATE matches 
-                SET status = $1
-                WHERE match_id = $2
-            """, status, match_id)
+            result = await conn.execute(HOT_STATEMENTS['update_match_status'], status, match_id)
+            self._match_cache.invalidate(match_id)
             return result != "UPDATE 0"
     
     async def update_match_host(self, match_id: str, new_host_id: int) -> bool:
         """Update match host"""
         async with self.pool.acquire() as conn:
-            result = await conn.execute("""
-                UPDATE matches 
-                SET host_id = $1
-                WHERE match_id = $2
-            """, new_host_id, match_id)
+            result = await conn.execute(HOT_STATEMENTS['update_match_host'], new_host_id, match_id)
+            self._match_cache.invalidate(match_id)
             return result != "UPDATE 0"
     
     # Match player operations
     async def add_player_to_match(self, match_id: str, user_id: int, username: str, team: str = None, role: str = None) -> bool:
         """Add player to match (creates/updates player record first)"""
-        async with self.pool.acquire() as conn:
-            try:
-                # Create or update player record
-                await self.create_or_update_player(user_id, username, username)
-                # Add player to match
-                await conn.execute("""
+        cached = self._player_cache.get(user_id)
+        if cached is not None and cached['username'] == username and cached['display_name'] == username:
+            # Player row is known to be up to date, only the match row is needed
+            async with self.pool.acquire() as conn:
+                result = await conn.fetchval("""
                     INSERT INTO match_players (match_id, user_id, team, role)
                     VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (match_id, user_id) DO NOTHING
+                    RETURNING id
                 """, match_id, user_id, team, role)
-                return True
-            except asyncpg.UniqueViolationError:
-                return False  # Player already in match
+            return result is not None  # None when player already in match
+        
+        async with self.pool.acquire() as conn:
+            # Upsert the player and insert the match row in a single round-trip.
+            # The upsert only rewrites the player row when the names changed.
+            result = await conn.fetchval("""
+                WITH up AS (
+                    INSERT INTO players (user_id, username, display_name, updated_at)
+                    VALUES ($1, $2, $3, CURRENT_TIMESTAMP)
+                    ON CONFLICT (user_id)
+                    DO UPDATE SET
+                        username = EXCLUDED.username,
+                        display_name = EXCLUDED.display_name,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE players.username IS DISTINCT FROM EXCLUDED.username
+                       OR players.display_name IS DISTINCT FROM EXCLUDED.display_name
+                )
+                INSERT INTO match_players (match_id, user_id, team, role)
+                VALUES ($4, $1, $5, $6)
+                ON CONFLICT (match_id, user_id) DO NOTHING
+                RETURNING id
+            """, user_id, username, username, match_id, team, role)
+            self._player_cache.invalidate(user_id)
+            return result is not None  # None when player already in match
     
-    async def get_match_players(self, match_id: str) -> List[Dict]:
+    async def get_match_players(self, match_id: str) -> List[asyncpg.Record]:
         """Get all players in a match"""
         async with self.pool.acquire() as conn:
             results = await conn.fetch("""
@@ -297,15 +495,12 @@ class DatabaseManager:
                 WHERE mp.match_id = $1
                 ORDER BY mp.team, mp.joined_at
             """, match_id)
-            return [dict(row) for row in results]
+            return results
     
     async def remove_player_from_match(self, match_id: str, user_id: int) -> bool:
         """Remove player from match"""
         async with self.pool.acquire() as conn:
-            result = await conn.execute("""
-                DELETE FROM match_players 
-                WHERE match_id = $1 AND user_id = $2
-            """, match_id, user_id)
+            result = await conn.execute(HOT_STATEMENTS['remove_player_from_match'], match_id, user_id)
             return result != "DELETE 0"
     
     async def update_player_role(self, match_id: str, user_id: int, team: str = None, role: str = None, is_captain: bool = None) -> bool:
@@ -344,6 +539,21 @@ class DatabaseManager:
             result = await conn.execute(query, *values)
             return result != "UPDATE 0"
     
+    async def bulk_update_player_roles(self, match_id: str, assignments: List[tuple]) -> None:
+        """Update team/role for several players in one batch
+        
+        Each assignment is (user_id, team, role), e.g. after shuffling players.
+        """
+        if not assignments:
+            return
+        
+        async with self.pool.acquire() as conn, conn.transaction():
+            await conn.executemany("""
+                UPDATE match_players
+                SET team = $1, role = $2
+                WHERE match_id = $3 AND user_id = $4
+            """, [(team, role, match_id, user_id) for user_id, team, role in assignments])
+    
     async def update_team_name(self, match_id: str, team: str, name: str) -> bool:
         """Update team name in match"""
         column = f"team_{team.lower()}_name"
@@ -351,40 +561,37 @@ class DatabaseManager:
         
         async with self.pool.acquire() as conn:
             result = await conn.execute(query, name, match_id)
+            self._match_cache.invalidate(match_id)
             return result != "UPDATE 0"
     
-    async def update_match_score(self, match_id: str, **score_data) -> bool:
-        """Update match score and stats"""
-        if not score_data:
-            return False
-            
-        set_clauses = []
-        values = []
-        param_count = 1
-        
-        # Allowed score fields
-        allowed_fields = ['team_a_score', 'team_b_score', 'score_a', 'score_b', 
-                         'shots_a', 'shots_b', 'saves_a', 'saves_b']
+    async def bulk_insert_events(self, match_id: str, events: List[tuple]) -> int:
+        """Insert match events in one COPY
         
-        for key, value in score_data.items():
-            if key in allowed_fields:
-                set_clauses.append(f"{key} = ${param_count}")
-                values.append(value)
-                param_count += 1
+        Each event is (event_type, player1_id, player2_id, team, description, minute).
+        """
+        if not events:
+            return 0
         
-        if not set_clauses:
+        records = [(match_id, *event) for event in events]
+        async with self.pool.acquire() as conn:
+            await conn.copy_records_to_table(
+                'match_events',
+                records=records,
+                columns=['match_id', 'event_type', 'player1_id', 'player2_id',
+                         'team', 'description', 'minute']
+            )
+        return len(records)
+    
+    async def update_match_score(self, match_id: str, **score_data) -> bool:
+        """Update match score and stats"""
+        # One positional value per allowed field, None leaves the field unchanged
+        values = [score_data.get(column) for column in MATCH_SCORE_COLUMNS]
+        if all(value is None for value in values):
             return False
         
-        values.append(match_id)  # For WHERE clause
-        
-        query = f"""
-            UPDATE matches 
-            SET {', '.join(set_clauses)}
-            WHERE match_id = ${param_count}
-        """
-        
         async with self.pool.acquire() as conn:
-            result = await conn.execute(query, *values)
+            result = await conn.execute(HOT_STATEMENTS['update_match_score'], *values, match_id)
+            self._match_cache.invalidate(match_id)
             return result != "UPDATE 0"
 
 # Global database manager instance
@@ -2,177 +2,201 @@
 Game Logic and Mechanics for Hand Hockey Discord Bot
 Handles range calculations and action evaluations
 """
-from typing import Tuple, Dict, Any
+from array import array
+from collections import Counter
+from functools import lru_cache
+import time
+from typing import Tuple, Dict, Any, List, Optional
 from config import Config
 
-class GameLogic:
-    """Core game logic for Hand Hockey"""
-    
-    @staticmethod
-    def get_action_range(attacker_role: str, defender_role: str, scenario: str) -> Tuple[int, int]:
-        """Get valid action range based on roles and scenario"""
-        ranges = {
-            ("ST", "DEF", "dribbling"): (1, 3),
-            ("ST", "MF", "dribbling"): (1, 3),
-            ("MF", "DEF", "passing"): (1, 3),
-            ("ST", "GK", "shooting"): (1, 6),
-            ("ST", "MF", "quick_pass"): (1, 2),
-            ("ST", "DEF", "corner_kick"): (4, 6),
-            ("GK", "ANY", "interception"): (1, 3),
-            ("MF", "GK", "long_shot"): (2, 5),
-            ("DEF", "ST", "tackle"): (1, 4),
-            ("ANY", "ANY", "default"): (1, 3)
+# Valid action ranges keyed by (attacker_role, defender_role, scenario)
+_RANGES: Dict[Tuple[str, str, str], Tuple[int, int]] = {
+    ("ST", "DEF", "dribbling"): (1, 3),
+    ("ST", "MF", "dribbling"): (1, 3),
+    ("MF", "DEF", "passing"): (1, 3),
+    ("ST", "GK", "shooting"): (1, 6),
+    ("ST", "MF", "quick_pass"): (1, 2),
+    ("ST", "DEF", "corner_kick"): (4, 6),
+    ("GK", "ANY", "interception"): (1, 3),
+    ("MF", "GK", "long_shot"): (2, 5),
+    ("DEF", "ST", "tackle"): (1, 4),
+}
+_DEFAULT_RANGE: Tuple[int, int] = (1, 3)
+
+# Base attack success probabilities keyed by (attacker_role, defender_role)
+_ROLE_ADVANTAGES: Dict[Tuple[str, str], float] = {
+    ("ST", "DEF"): 0.6,  # Striker vs Defender
+    ("ST", "MF"): 0.7,   # Striker vs Midfielder  
+    ("ST", "GK"): 0.4,   # Striker vs Goalkeeper
+    ("MF", "DEF"): 0.5,  # Midfielder vs Defender
+    ("MF", "GK"): 0.3,   # Midfielder vs Goalkeeper
+    ("DEF", "ST"): 0.4,  # Defender vs Striker (tackles)
+}
+
+# Scenario modifiers applied to the base probability
+_SCENARIO_MODIFIERS: Dict[str, float] = {
+    "shooting": -0.1,      # Shooting is harder
+    "dribbling": 0.0,      # Neutral
+    "passing": 0.1,        # Passing is easier
+    "corner_kick": 0.2,    # Corner kicks have advantage
+    "free_kick": 0.15,     # Free kicks have slight advantage
+    "penalty": 0.8,        # Penalties heavily favor attacker
+}
+
+_SCENARIO_DESCRIPTIONS: Dict[str, str] = {
+    "dribbling": "Player attempts to dribble past opponent",
+    "passing": "Player attempts to pass the ball",
+    "shooting": "Player takes a shot on goal",
+    "corner_kick": "Corner kick situation",
+    "free_kick": "Free kick awarded",
+    "penalty": "Penalty kick situation",
+    "tackle": "Defender attempts to tackle",
+    "interception": "Player attempts to intercept pass",
+    "long_shot": "Long-range shot attempt",
+    "quick_pass": "Quick pass attempt",
+    "default": "General gameplay situation"
+}
+
+# Minimum players per position, checked in this order
+_REQUIRED_POSITIONS: Tuple[Tuple[str, int], ...] = (("GK", 1), ("DEF", 1), ("MF", 1), ("ST", 1))
+
+@lru_cache(maxsize=128)
+def _success_probability(attacker_role: str, defender_role: str, scenario: str) -> float:
+    """Success probability for normalized roles/scenario, memoized (small input domain)"""
+    base_prob = _ROLE_ADVANTAGES.get((attacker_role, defender_role), 0.5)  # Default 50/50
+    scenario_mod = _SCENARIO_MODIFIERS.get(scenario, 0.0)
+    return max(0.1, min(0.9, base_prob + scenario_mod))
+
+def get_action_range(attacker_role: str, defender_role: str, scenario: str) -> Tuple[int, int]:
+    """Get valid action range based on roles and scenario"""
+    return _get_action_range_normalized(
+        attacker_role.upper(), defender_role.upper(), scenario.lower()
+    )
+
+def _get_action_range_normalized(attacker_role: str, defender_role: str, scenario: str) -> Tuple[int, int]:
+    """Action range lookup for roles already upper-cased and scenario lower-cased"""
+    return _RANGES.get((attacker_role, defender_role, scenario), _DEFAULT_RANGE)
+
+def evaluate_action(attacker_action: int, defender_action: int, 
+                   attacker_role: str, defender_role: str, scenario: str = "default") -> Dict[str, Any]:
+    """Evaluate the outcome of actions"""
+    
+    # Normalize once, everything below compares against these
+    attacker = attacker_role.upper()
+    defender = defender_role.upper()
+    scenario = scenario.lower()
+    
+    # Validate action ranges first
+    valid_range = _get_action_range_normalized(attacker, defender, scenario)
+    if not (valid_range[0] <= attacker_action <= valid_range[1]):
+        return {
+            "result": "invalid_action",
+            "description": f"Invalid action for {attacker_role}. Must be between {valid_range[0]}-{valid_range[1]}",
+            "success": False
         }
-        
-        key = (attacker_role.upper(), defender_role.upper(), scenario.lower())
-        return ranges.get(key, ranges[("ANY", "ANY", "default")])
     
-    @staticmethod
-    def evaluate_action(attacker_action: int, defender_action: int, 
-                       attacker_role: str, defender_role: str, scenario: str = "default") -> Dict[str, Any]:
-        """Evaluate the outcome of actions"""
-        
-        # Validate action ranges first
-        valid_range = GameLogic.get_action_range(attacker_role, defender_role, scenario)
-        if not (valid_range[0] <= attacker_action <= valid_range[1]):
+    if not (valid_range[0] <= defender_action <= valid_range[1]):
+        return {
+            "result": "invalid_action", 
+            "description": f"Invalid action for {defender_role}. Must be between {valid_range[0]}-{valid_range[1]}",
+            "success": False
+        }
+    
+    # Same number scenarios
+    if attacker_action == defender_action:
+        if defender == "GK":
             return {
-                "result": "invalid_action",
-                "description": f"Invalid action for {attacker_role}. Must be between {valid_range[0]}-{valid_range[1]}",
-                "success": False
+                "result": "save",
+                "description": "Goalkeeper makes a crucial save!",
+                "success": False,
+                "next_action": "corner_kick"
             }
-        
-        if not (valid_range[0] <= defender_action <= valid_range[1]):
+        elif attacker == "ST" and defender == "DEF":
             return {
-                "result": "invalid_action", 
-                "description": f"Invalid action for {defender_role}. Must be between {valid_range[0]}-{valid_range[1]}",
-                "success": False
+                "result": "foul",
+                "description": "Defensive foul committed!",
+                "success": True,
+                "next_action": "free_kick"
             }
-        
-        # Same number scenarios
-        if attacker_action == defender_action:
-            if defender_role.upper() == "GK":
-                return {
-                    "result": "save",
-                    "description": "Goalkeeper makes a crucial save!",
-                    "success": False,
-                    "next_action": "corner_kick"
-                }
-            elif attacker_role.upper() == "ST" and defender_role.upper() == "DEF":
-                return {
-                    "result": "foul",
-                    "description": "Defensive foul committed!",
-                    "success": True,
-                    "next_action": "free_kick"
-                }
-            else:
-                return {
-                    "result": "interception",
-                    "description": "Ball intercepted! Possession changes.",
-                    "success": False,
-                    "next_action": "possession_change"
-                }
-        
-        # Attacker wins
-        elif attacker_action > defender_action:
-            if scenario == "shooting" and defender_role.upper() == "GK":
-                return {
-                    "result": "goal",
-                    "description": "GOAL! What a fantastic strike!",
-                    "success": True,
-                    "next_action": "kickoff"
-                }
-            else:
-                return {
-                    "result": "success",
-                    "description": "Action successful! Attacker advances.",
-                    "success": True,
-                    "next_action": "continue_attack"
-                }
-        
-        # Defender wins
         else:
-            if defender_role.upper() == "GK":
-                return {
-                    "result": "save",
-                    "description": "Great save by the goalkeeper!",
-                    "success": False,
-                    "next_action": "goalkeeper_possession"
-                }
-            else:
-                return {
-                    "result": "blocked",
-                    "description": "Action blocked by defender!",
-                    "success": False,
-                    "next_action": "possession_change"
-                }
-    
-    @staticmethod
-    def calculate_success_probability(attacker_role: str, defender_role: str, scenario: str) -> float:
-        """Calculate probability of attack success based on roles and scenario"""
-        
-        # Base probabilities
-        role_advantages = {
-            ("ST", "DEF"): 0.6,  # Striker vs Defender
-            ("ST", "MF"): 0.7,   # Striker vs Midfielder  
-            ("ST", "GK"): 0.4,   # Striker vs Goalkeeper
-            ("MF", "DEF"): 0.5,  # Midfielder vs Defender
-            ("MF", "GK"): 0.3,   # Midfielder vs Goalkeeper
-            ("DEF", "ST"): 0.4,  # Defender vs Striker (tackles)
-        }
-        
-        # Scenario modifiers
-        scenario_modifiers = {
-            "shooting": -0.1,      # Shooting is harder
-            "dribbling": 0.0,      # Neutral
-            "passing": 0.1,        # Passing is easier
-            "corner_kick": 0.2,    # Corner kicks have advantage
-            "free_kick": 0.15,     # Free kicks have slight advantage
-            "penalty": 0.8,        # Penalties heavily favor attacker
-        }
-        
-        key = (attacker_role.upper(), defender_role.upper())
-        base_prob = role_advantages.get(key, 0.5)  # Default 50/50
-        
-        scenario_mod = scenario_modifiers.get(scenario.lower(), 0.0)
-        
-        final_prob = max(0.1, min(0.9, base_prob + scenario_mod))
-        return final_prob
-    
-    @staticmethod
-    def get_scenario_description(scenario: str) -> str:
-        """Get human-readable description of scenario"""
-        descriptions = {
-            "dribbling": "Player attempts to dribble past opponent",
-            "passing": "Player attempts to pass the ball",
-            "shooting": "Player takes a shot on goal",
-            "corner_kick": "Corner kick situation",
-            "free_kick": "Free kick awarded",
-            "penalty": "Penalty kick situation",
-            "tackle": "Defender attempts to tackle",
-            "interception": "Player attempts to intercept pass",
-            "long_shot": "Long-range shot attempt",
-            "quick_pass": "Quick pass attempt",
-            "default": "General gameplay situation"
-        }
-        
-        return descriptions.get(scenario.lower(), descriptions["default"])
+            return {
+                "result": "interception",
+                "description": "Ball intercepted! Possession changes.",
+                "success": False,
+                "next_action": "possession_change"
+            }
     
-    @staticmethod
-    def validate_team_formation(team_players: Dict[str, str]) -> Tuple[bool, str]:
-        """Validate team formation has required positions"""
-        required_positions = {"GK": 1, "DEF": 1, "MF": 1, "ST": 1}
-        position_counts = {}
-        
-        for player_id, position in team_players.items():
-            position = position.upper()
-            position_counts[position] = position_counts.get(position, 0) + 1
-        
-        # Check if all required positions are filled
-        for position, required_count in required_positions.items():
-            if position_counts.get(position, 0) < required_count:
-                return False, f"Team needs at least {required_count} {position}"
-        
-        return True, "Formation is valid"
+    # Attacker wins
+    elif attacker_action > defender_action:
+        if scenario == "shooting" and defender == "GK":
+            return {
+                "result": "goal",
+                "description": "GOAL! What a fantastic strike!",
+                "success": True,
+                "next_action": "kickoff"
+            }
+        else:
+            return {
+                "result": "success",
+                "description": "Action successful! Attacker advances.",
+                "success": True,
+                "next_action": "continue_attack"
+            }
+    
+    # Defender wins
+    else:
+        if defender == "GK":
+            return {
+                "result": "save",
+                "description": "Great save by the goalkeeper!",
+                "success": False,
+                "next_action": "goalkeeper_possession"
+            }
+        else:
+            return {
+                "result": "blocked",
+                "description": "Action blocked by defender!",
+                "success": False,
+                "next_action": "possession_change"
+            }
+
+def calculate_success_probability(attacker_role: str, defender_role: str, scenario: str) -> float:
+    """Calculate probability of attack success based on roles and scenario"""
+    return _success_probability(attacker_role.upper(), defender_role.upper(), scenario.lower())
+
+def get_scenario_description(scenario: str) -> str:
+    """Get human-readable description of scenario"""
+    return _SCENARIO_DESCRIPTIONS.get(scenario.lower(), _SCENARIO_DESCRIPTIONS["default"])
+
+def validate_team_formation(team_players: Dict[str, str]) -> Tuple[bool, str]:
+    """Validate team formation has required positions"""
+    position_counts = Counter(position.upper() for position in team_players.values())
+    
+    # Check if all required positions are filled
+    for position, required_count in _REQUIRED_POSITIONS:
+        if position_counts[position] < required_count:
+            return False, f"Team needs at least {required_count} {position}"
+    
+    return True, "Formation is valid"
+
+class GameLogic:
+    """Core game logic for Hand Hockey, kept for callers using GameLogic.<name>"""
+    
+    get_action_range = staticmethod(get_action_range)
+    _get_action_range_normalized = staticmethod(_get_action_range_normalized)
+    evaluate_action = staticmethod(evaluate_action)
+    calculate_success_probability = staticmethod(calculate_success_probability)
+    get_scenario_description = staticmethod(get_scenario_description)
+    validate_team_formation = staticmethod(validate_team_formation)
+
+# MatchState statistics layout: one flat slot per (team, stat_type)
+_STAT_TEAMS = ("A", "B")
+_STAT_TYPES = ("shots", "saves", "fouls", "corners")
+_STAT_INDEX: Dict[Tuple[str, str], int] = {
+    (team, stat_type): t * len(_STAT_TYPES) + s
+    for t, team in enumerate(_STAT_TEAMS)
+    for s, stat_type in enumerate(_STAT_TYPES)
+}
 
 class MatchState:
     """Manages the state of an active match"""
@@ -185,12 +209,13 @@ class MatchState:
         self.turn_count = 0
         self.match_time = 0  # In minutes
         self.status = "active"
+        self.created_at_mono = time.monotonic()  # For is_match_expired
         
-        # Statistics tracking
-        self.stats = {
-            "A": {"shots": 0, "saves": 0, "fouls": 0, "corners": 0},
-            "B": {"shots": 0, "saves": 0, "fouls": 0, "corners": 0}
-        }
+        # Statistics tracking, one int per (team, stat_type), see _STAT_INDEX
+        self.stats = array('i', [0] * len(_STAT_INDEX))
+        
+        # Events not yet written to the database, see flush()
+        self._pending_events: List[tuple] = []
     
     def update_score(self, team: str, points: int = 1):
         """Update team score"""
@@ -203,8 +228,55 @@ class MatchState:
     
     def update_stats(self, team: str, stat_type: str, value: int = 1):
         """Update team statistics"""
-        if team in self.stats and stat_type in self.stats[team]:
-            self.stats[team][stat_type] += value
+        idx = _STAT_INDEX.get((team, stat_type))
+        if idx is not None:
+            self.stats[idx] += value
+    
+    def get_stat(self, team: str, stat_type: str) -> int:
+        """Get a single team statistic"""
+        idx = _STAT_INDEX.get((team, stat_type))
+        return self.stats[idx] if idx is not None else 0
+    
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get team statistics as a nested dict"""
+        stats = self.stats.tolist()
+        per_team = len(_STAT_TYPES)
+        return {
+            team: dict(zip(_STAT_TYPES, stats[t * per_team:(t + 1) * per_team]))
+            for t, team in enumerate(_STAT_TEAMS)
+        }
+    
+    def record_event(self, event_type: str, team: str = None, description: str = None,
+                     player1_id: Optional[int] = None, player2_id: Optional[int] = None):
+        """Buffer a match event until the next flush"""
+        self._pending_events.append(
+            (event_type, player1_id, player2_id, team, description, self.match_time)
+        )
+    
+    async def flush(self, db) -> bool:
+        """Write buffered events and current score/stats to the database
+        
+        Meant to be called at scenario boundaries rather than after every action.
+        """
+        events, self._pending_events = self._pending_events, []
+        try:
+            await db.bulk_insert_events(self.match_id, events)
+        except Exception:
+            # Keep unsaved events for the next flush
+            self._pending_events[:0] = events
+            raise
+        
+        return await db.update_match_score(
+            self.match_id,
+            team_a_score=self.score["A"],
+            team_b_score=self.score["B"],
+            score_a=self.score["A"],
+            score_b=self.score["B"],
+            shots_a=self.get_stat("A", "shots"),
+            shots_b=self.get_stat("B", "shots"),
+            saves_a=self.get_stat("A", "saves"),
+            saves_b=self.get_stat("B", "saves")
+        )
     
     def get_match_summary(self) -> Dict[str, Any]:
         """Get current match summary"""
@@ -215,6 +287,6 @@ class MatchState:
             "scenario": self.current_scenario,
             "time": self.match_time,
             "status": self.status,
-            "stats": self.stats.copy(),
+            "stats": self.get_stats(),
             "turn_count": self.turn_count
         }
@@ -4,18 +4,39 @@ Loads all command modules and starts the bot
 """
 import discord
 from discord.ext import commands
-import os
-from dotenv import load_dotenv
 import asyncio
+import atexit
 import logging
+import logging.handlers
+import queue
 import os
 import sys
-from pathlib import Path
-from config import Config
+from config import Config  # Also loads .env when present
+
+try:
+    import uvloop  # Faster event loop, not available on Windows
+except ImportError:
+    uvloop = None
 
-load_dotenv()
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route all log records through a queue so file/console writes happen off the event loop"""
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler('hand_hockey_bot.log')
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(Config.LOG_LEVEL)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)  # Flush remaining records on shutdown
+    return listener
 
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 TOKEN = os.getenv('DISCORD_TOKEN')
@@ -23,6 +44,15 @@ if not TOKEN:
     logger.error("DISCORD_TOKEN is not set in the environment variables")
     raise ValueError("Discord token not found")
 
+# Target guild for command sync, None syncs globally
+_GUILD_OBJ = discord.Object(id=Config.GUILD_ID) if Config.GUILD_ID else None
+
+# Extension modules to load, discovered once at import
+_COG_MODULES = tuple(
+    f'cogs.{entry.name[:-3]}' for entry in os.scandir('./cogs')
+    if entry.is_file() and entry.name.endswith('.py') and not entry.name.startswith('__')
+)
+
 intents = discord.Intents.default()
 intents.message_content = True
 intents.guilds = True
@@ -36,6 +66,7 @@ class HandHockeyBot(commands.Bot):
             help_command=None,  # Help command is loaded as a cog
             application_id=Config.APPLICATION_ID
         )
+        self._synced = False
     
     async def on_command_error(self, ctx, error):
         """Global error handler for the bot"""
@@ -43,9 +74,17 @@ class HandHockeyBot(commands.Bot):
         if isinstance(error, commands.CommandNotFound):
             return
         
+        # Non-owners trying owner-only commands (e.g. sync) aren't bot errors
+        if isinstance(error, commands.NotOwner):
+            logger.debug("Ignored owner-only command %s from %s", ctx.command, ctx.author)
+            return
+        
         # Let other errors bubble up to be handled by cog error handlers
-        # If no cog handles it, log the error
-        logger.error(f"Unhandled command error: {error}", exc_info=True)
+        # If no cog handles it, log the error. Skip all formatting when ERROR is
+        # filtered out; pass the error itself as exc_info since this runs in a
+        # separate task where there is no active exception to pick up
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("Unhandled command error: %s", error, exc_info=error)
 
     async def setup_hook(self):
         # Initialize database
@@ -56,37 +95,59 @@ class HandHockeyBot(commands.Bot):
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
             raise
-        # Load all cogs from the cogs directory
-        for filename in os.listdir('./cogs'):
-            if filename.endswith('.py') and not filename.startswith('__'):
-                try:
-                    await self.load_extension(f'cogs.{filename[:-3]}')
-                    logger.info(f"Loaded cog: {filename}")
-                except Exception as e:
-                    logger.error(f"Failed to load cog {filename}: {e}")
+        # Load all cogs from the cogs directory concurrently
+        results = await asyncio.gather(
+            *(self.load_extension(module) for module in _COG_MODULES),
+            return_exceptions=True
+        )
+        for module, result in zip(_COG_MODULES, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to load cog {module}: {result}")
+            else:
+                logger.info(f"Loaded cog: {module}")
         logger.info("All cogs loaded successfully")
 
     async def on_ready(self):
+        # on_ready fires again on every reconnect, so slash commands are
+        # synced with the owner-only sync command, or once per process
+        # when SYNC_ON_READY is enabled
         logger.info(f'Logged in as {self.user} (ID: {self.user.id})')
         logger.info('------')
-        # Sync commands
+        if not Config.SYNC_ON_READY or self._synced:
+            return
+        self._synced = await self.sync_commands()
+    
+    async def sync_commands(self) -> bool:
+        """Sync the application command tree with Discord"""
         try:
             logger.info("Starting command sync...")
-            if Config.GUILD_ID:
+            if _GUILD_OBJ:
                 # Sync to specific guild for faster development (instant)
-                guild = discord.Object(id=Config.GUILD_ID)
-                await self.tree.sync(guild=guild)
-                logger.info(f"Command tree synced successfully to guild {Config.GUILD_ID}!")
+                await self.tree.sync(guild=_GUILD_OBJ)
+                logger.info(f"Command tree synced successfully to guild {_GUILD_OBJ.id}!")
             else:
                 # Global sync (takes up to 1 hour)
                 await self.tree.sync()
                 logger.info("Command tree synced globally!")
+            return True
         except Exception as e:
             logger.error(f"Failed to sync commands: {e}")
+            return False
 
 bot = HandHockeyBot()
 
+@bot.command(name='sync')
+@commands.is_owner()
+async def sync(ctx):
+    """Sync slash commands (bot owner only)"""
+    if await bot.sync_commands():
+        await ctx.send("✅ Command tree synced")
+    else:
+        await ctx.send("❌ Failed to sync commands, check the logs")
+
 async def main():
+    loop = asyncio.get_running_loop()
+    logger.info(f"Using event loop {type(loop).__module__}.{type(loop).__name__}")
     async with bot:
         try:
             await bot.start(TOKEN)
@@ -94,4 +155,10 @@ async def main():
             logger.error(f"Error starting bot: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is None:
+        asyncio.run(main())
+    elif sys.version_info >= (3, 12):
+        asyncio.run(main(), loop_factory=uvloop.new_event_loop)
+    else:
+        uvloop.install()
+        asyncio.run(main())
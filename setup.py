@@ -24,7 +24,11 @@ def install_dependencies():
     print("📦 Installing dependencies...")
     
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        # Skip pip's self-version check, it's a network round-trip on every run
+        subprocess.check_call([
+            sys.executable, "-m", "pip", "install", "-r", "requirements.txt",
+            "--disable-pip-version-check"
+        ])
         print("✅ Dependencies installed successfully!")
         return True
     except subprocess.CalledProcessError as e:
@@ -95,9 +99,19 @@ def validate_project_structure():
         "cogs/player_stats.py"
     ]
     
+    # List each parent directory once instead of stat()-ing every file
+    existing = {}
+    for parent in {os.path.dirname(file_path) or "." for file_path in required_files}:
+        try:
+            with os.scandir(parent) as entries:
+                existing[parent] = {entry.name for entry in entries}
+        except FileNotFoundError:
+            existing[parent] = set()
+    
     missing_files = []
     for file_path in required_files:
-        if not Path(file_path).exists():
+        parent, name = os.path.split(file_path)
+        if name not in existing[parent or "."]:
             missing_files.append(file_path)
     
     if missing_files:
@@ -7,6 +7,7 @@ import asyncio
 import sys
 import logging
 from database import db_manager
+from game_logic import MatchState
 from config import Config
 
 # Setup logging
@@ -14,16 +15,8 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 async def test_database_operations():
-    """Test all database operations"""
-    print("🔍 STARTING DATABASE SCHEMA VERIFICATION...")
-    print("=" * 60)
-    
+    """Test all database operations (expects db_manager to be initialized)"""
     try:
-        # Test 1: Initialize database
-        print("1️⃣ Testing database initialization...")
-        await db_manager.initialize()
-        print("✅ Database initialized successfully")
-        
         # Test 2: Player operations
         print("\n2️⃣ Testing player operations...")
         test_user_id = 123456789
@@ -93,7 +86,7 @@ async def test_database_operations():
         
         # Add player to match
         player_added = await db_manager.add_player_to_match(
-            test_match_id, test_user_id, team="A", role="ST"
+            test_match_id, test_user_id, test_username, team="A", role="ST"
         )
         print(f"✅ Player added to match: {player_added}")
         
@@ -114,24 +107,86 @@ async def test_database_operations():
         status_updated = await db_manager.update_match_status(test_match_id, "ongoing")
         print(f"✅ Match status updated: {status_updated}")
         
-        # Get user active match
-        user_active_match = await db_manager.get_user_active_match(test_user_id)
+        # Get user active match and all active matches (independent reads)
+        user_active_match, active_matches = await asyncio.gather(
+            db_manager.get_user_active_match(test_user_id),
+            db_manager.get_active_matches()
+        )
         print(f"✅ User active match: {user_active_match}")
-        
-        # Get all active matches
-        active_matches = await db_manager.get_active_matches()
         print(f"✅ Active matches: {len(active_matches)} found")
         
         # Test 7: Team name operations
         print("\n7️⃣ Testing team name operations...")
-        team_name_updated = await db_manager.update_team_name(test_match_id, "A", "Ice Breakers")
-        print(f"✅ Team A name updated: {team_name_updated}")
+        team_a_updated, team_b_updated = await asyncio.gather(
+            db_manager.update_team_name(test_match_id, "A", "Ice Breakers"),
+            db_manager.update_team_name(test_match_id, "B", "Fire Blazers")
+        )
+        print(f"✅ Team A name updated: {team_a_updated}")
+        print(f"✅ Team B name updated: {team_b_updated}")
+        
+        # Test 8: Match event batching
+        print("\n8️⃣ Testing match event batching...")
+        
+        # Insert events in one COPY
+        events_inserted = await db_manager.bulk_insert_events(test_match_id, [
+            ("goal", test_user_id, None, "A", "Test goal", 5),
+            ("save", test_user_id, None, "B", "Test save", 7)
+        ])
+        print(f"✅ Events inserted: {events_inserted}")
+        
+        # Flush buffered events and score/stats from a match state
+        match_state = MatchState(test_match_id)
+        match_state.update_score("A")
+        match_state.update_stats("A", "shots", 3)
+        match_state.record_event("shot", team="A", description="Test shot", player1_id=test_user_id)
+        state_flushed = await match_state.flush(db_manager)
+        print(f"✅ Match state flushed: {state_flushed}")
+        
+        # Verify flushed score
+        flushed_match = await db_manager.get_match(test_match_id)
+        print(f"✅ Flushed match data: {flushed_match}")
+        
+        # Test 9: Batched match setup operations
+        print("\n9️⃣ Testing batched match setup operations...")
+        
+        # Create a match with team names in one transaction
+        full_match_id = "test_full_match_123"
+        full_match = await db_manager.create_match_full(
+            full_match_id, test_host_id, test_channel_id,
+            team_a_name="Frost Giants", team_b_name="Storm Riders"
+        )
+        print(f"✅ Match created with team names: {full_match}")
+        await db_manager.delete_match(full_match_id)
         
-        team_name_updated = await db_manager.update_team_name(test_match_id, "B", "Fire Blazers")
-        print(f"✅ Team B name updated: {team_name_updated}")
+        # Reassign team/role for match players in one batch
+        await db_manager.bulk_update_player_roles(test_match_id, [(test_user_id, "A", "MF")])
+        match_players = await db_manager.get_match_players(test_match_id)
+        print(f"✅ Player roles batch updated: {match_players}")
         
-        # Test 8: Cleanup operations
-        print("\n8️⃣ Testing cleanup operations...")
+        # Test 10: Active match paging
+        print("\n🔟 Testing active match paging...")
+        
+        # Fetch pages with the default list columns
+        first_page, second_page = await asyncio.gather(
+            db_manager.get_active_matches(limit=1),
+            db_manager.get_active_matches(limit=1, offset=1)
+        )
+        print(f"✅ First page: {len(first_page)} match(es), columns: {list(first_page[0].keys()) if first_page else []}")
+        print(f"✅ Second page: {len(second_page)} match(es)")
+        
+        # Fetch a page with explicit columns
+        score_page = await db_manager.get_active_matches(limit=1, columns=('match_id', 'score_a', 'score_b'))
+        print(f"✅ Score columns page: {score_page}")
+        
+        # Unknown columns are rejected before querying
+        try:
+            await db_manager.get_active_matches(columns=('match_id', 'password'))
+            raise AssertionError("get_active_matches accepted an unknown column")
+        except ValueError as e:
+            print(f"✅ Unknown column rejected: {e}")
+        
+        # Test 11: Cleanup operations
+        print("\n1️⃣1️⃣ Testing cleanup operations...")
         
         # Remove player from match
         player_removed = await db_manager.remove_player_from_match(test_match_id, test_user_id)
@@ -153,20 +208,13 @@ async def test_database_operations():
         print(f"\n❌ TEST FAILED: {e}")
         logger.error(f"Database test error: {e}")
         return False
-        
-    finally:
-        # Close database connection
-        await db_manager.close()
-        print("\n🔒 Database connection closed")
 
 async def test_schema_compatibility():
-    """Test schema compatibility with existing code"""
+    """Test schema compatibility with existing code (expects db_manager to be initialized)"""
     print("\n🔍 TESTING SCHEMA COMPATIBILITY...")
     print("=" * 60)
     
     try:
-        await db_manager.initialize()
-        
         # Test player stats access pattern (as used in player_stats.py)
         test_user_id = 123456789
         await db_manager.create_or_update_player(test_user_id, "test_user", "Test User")
@@ -226,19 +274,47 @@ async def test_schema_compatibility():
     except Exception as e:
         print(f"❌ COMPATIBILITY TEST FAILED: {e}")
         return False
+
+async def _main():
+    """Run all test sections on one event loop and one connection pool"""
+    print("🔍 STARTING DATABASE SCHEMA VERIFICATION...")
+    print("=" * 60)
+    
+    # Test 1: Initialize database
+    print("1️⃣ Testing database initialization...")
+    try:
+        await db_manager.initialize()
+    except Exception as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        logger.error(f"Database test error: {e}")
+        return False, False
+    print("✅ Database initialized successfully")
+    
+    try:
+        # Run basic database tests
+        success1 = await test_database_operations()
+        sys.stdout.flush()
+        
+        # Run schema compatibility tests
+        success2 = await test_schema_compatibility()
+        sys.stdout.flush()
+        return success1, success2
     finally:
+        # Close database connection
         await db_manager.close()
+        print("\n🔒 Database connection closed")
 
 def main():
     """Main test function"""
+    if not sys.stdout.isatty():
+        # CI/containers often force unbuffered stdout (PYTHONUNBUFFERED), which
+        # makes every print a write syscall; buffer and flush once per section
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    
     print("🏒 HAND HOCKEY DATABASE SCHEMA VERIFICATION")
     print("=" * 60)
     
-    # Run basic database tests
-    success1 = asyncio.run(test_database_operations())
-    
-    # Run schema compatibility tests
-    success2 = asyncio.run(test_schema_compatibility())
+    success1, success2 = asyncio.run(_main())
     
     if success1 and success2:
         print("\n🎉 ALL TESTS PASSED - DATABASE IS READY!")
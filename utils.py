@@ -6,20 +6,11 @@ from discord.ext import commands
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union, Iterable, List
 from config import Config
-import random
-import string
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('hand_hockey_bot.log'),
-        logging.StreamHandler()
-    ]
-)
+import base64
+import os
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -39,102 +30,134 @@ class ValidationError(BotError):
     """Exception for validation errors"""
     pass
 
+# Title prefix and color for each standardized embed kind
+_EMBED_KINDS = {
+    "error": ("❌", Config.Colors.ERROR),
+    "success": ("✅", Config.Colors.SUCCESS),
+    "warning": ("⚠️", Config.Colors.WARNING),
+    "info": ("ℹ️", Config.Colors.INFO),
+}
+
+def _embed(kind: str, title: str, description: str) -> discord.Embed:
+    """Create a standardized embed of the given kind"""
+    prefix, color = _EMBED_KINDS[kind]
+    return discord.Embed(title=f"{prefix} {title}", description=description, color=color)
+
 def create_error_embed(title: str, description: str) -> discord.Embed:
     """Create a standardized error embed"""
-    embed = discord.Embed(
-        title=f"❌ {title}",
-        description=description,
-        color=Config.Colors.ERROR
-    )
-    return embed
+    return _embed("error", title, description)
 
 def create_success_embed(title: str, description: str) -> discord.Embed:
     """Create a standardized success embed"""
-    embed = discord.Embed(
-        title=f"✅ {title}",
-        description=description,
-        color=Config.Colors.SUCCESS
-    )
-    return embed
+    return _embed("success", title, description)
 
 def create_warning_embed(title: str, description: str) -> discord.Embed:
     """Create a standardized warning embed"""
-    embed = discord.Embed(
-        title=f"⚠️ {title}",
-        description=description,
-        color=Config.Colors.WARNING
-    )
-    return embed
+    return _embed("warning", title, description)
 
 def create_info_embed(title: str, description: str) -> discord.Embed:
     """Create a standardized info embed"""
-    embed = discord.Embed(
-        title=f"ℹ️ {title}",
-        description=description,
-        color=Config.Colors.INFO
-    )
-    return embed
+    return _embed("info", title, description)
+
+# Pre-joined for validation error messages
+_VALID_TEAMS_STR = ", ".join(sorted(Config.VALID_TEAMS))
+_VALID_ROLES_STR = ", ".join(sorted(Config.VALID_ROLES))
 
 def validate_team(team: str) -> str:
     """Validate and normalize team input"""
     team = team.upper().strip()
     if team not in Config.VALID_TEAMS:
-        raise ValidationError(f"Team must be one of: {', '.join(Config.VALID_TEAMS)}")
+        raise ValidationError(f"Team must be one of: {_VALID_TEAMS_STR}")
     return team
 
 def validate_role(role: str) -> str:
     """Validate and normalize role input"""
     role = role.upper().strip()
     if role not in Config.VALID_ROLES:
-        raise ValidationError(f"Role must be one of: {', '.join(Config.VALID_ROLES)}")
+        raise ValidationError(f"Role must be one of: {_VALID_ROLES_STR}")
     return role
 
+_ROLE_EMOJIS = {
+    "ST": "⚽",  # Striker
+    "MF": "🏃",  # Midfielder
+    "DEF": "🛡️",  # Defender
+    "GK": "🧤"   # Goalkeeper
+}
+
+_ROLE_NAMES = {
+    "ST": "Striker",
+    "MF": "Midfielder", 
+    "DEF": "Defender",
+    "GK": "Goalkeeper"
+}
+
 def get_role_emoji(role: str) -> str:
     """Get emoji for a role"""
-    role_emojis = {
-        "ST": "⚽",  # Striker
-        "MF": "🏃",  # Midfielder
-        "DEF": "🛡️",  # Defender
-        "GK": "🧤"   # Goalkeeper
-    }
-    return role_emojis.get(role.upper(), "❓")
+    return _ROLE_EMOJIS.get(role.upper(), "❓")
+
+def get_role_emoji_norm(role: str) -> str:
+    """Get emoji for a role already normalized by validate_role"""
+    return _ROLE_EMOJIS.get(role, "❓")
 
 def get_role_name(role: str) -> str:
     """Get full name for a role"""
-    role_names = {
-        "ST": "Striker",
-        "MF": "Midfielder", 
-        "DEF": "Defender",
-        "GK": "Goalkeeper"
-    }
-    return role_names.get(role.upper(), "Unknown")
+    return _ROLE_NAMES.get(role.upper(), "Unknown")
+
+def get_role_name_norm(role: str) -> str:
+    """Get full name for a role already normalized by validate_role"""
+    return _ROLE_NAMES.get(role, "Unknown")
 
 def generate_match_id(user_id: int = None) -> str:
     """Generate a short, user-friendly match ID"""
-    code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+    # 6 base32 characters (A-Z, 2-7) from 30 random bits in a single C call
+    code = base64.b32encode(os.urandom(4)).decode('ascii')[:6]
     return f"match_{code}"
 
-def is_match_expired(created_at: datetime) -> bool:
-    """Check if a match has expired"""
+def is_match_expired(created_at: Union[float, datetime]) -> bool:
+    """Check if a match has expired
+    
+    Accepts a time.monotonic() timestamp (e.g. MatchState.created_at_mono),
+    which is plain float arithmetic, or a datetime such as the database's created_at.
+    """
+    if isinstance(created_at, (int, float)):
+        return time.monotonic() - created_at > Config.MATCH_TIMEOUT_MINUTES * 60
     expiry_time = created_at + timedelta(minutes=Config.MATCH_TIMEOUT_MINUTES)
     return datetime.now() > expiry_time
 
 async def send_dm_safely(user: discord.User, embed: discord.Embed) -> bool:
     """Safely send a DM to a user with error handling"""
+    name = user.name
     try:
         await user.send(embed=embed)
-        logger.info(f"DM sent successfully to {user.name}")
+        logger.info("DM sent successfully to %s", name)
         return True
     except discord.Forbidden:
-        logger.warning(f"Cannot send DM to {user.name} - DMs are disabled")
+        logger.warning("Cannot send DM to %s - DMs are disabled", name)
         return False
     except discord.HTTPException as e:
-        logger.error(f"Failed to send DM to {user.name}: {e}")
+        logger.error("Failed to send DM to %s: %s", name, e)
         return False
 
+async def send_dms(users: Iterable[discord.User], embed: discord.Embed, concurrency: int = 5) -> List[bool]:
+    """Send the same DM to several users, at most `concurrency` at a time
+    
+    Returns the send_dm_safely result for each user, in order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def bounded(user: discord.User) -> bool:
+        async with semaphore:
+            return await send_dm_safely(user, embed)
+    
+    return list(await asyncio.gather(*(bounded(user) for user in users)))
+
 async def timeout_handler(coro, timeout: int):
     """Handle coroutine with timeout"""
     try:
+        if hasattr(asyncio, 'timeout'):
+            # Python 3.11+: runs the coroutine in the current task, no wrapper task/future
+            async with asyncio.timeout(timeout):
+                return await coro
         return await asyncio.wait_for(coro, timeout=timeout)
     except asyncio.TimeoutError:
         logger.warning(f"Operation timed out after {timeout} seconds")
@@ -154,40 +177,41 @@ def log_command_usage(ctx, command_name: str, additional_info: str = ""):
 class ErrorHandler:
     """Centralized error handling"""
     
+    # Error type -> (embed title, description builder)
+    _HANDLERS = {
+        ValidationError: ("Invalid Input", str),
+        MatchError: ("Match Error", str),
+        PlayerError: ("Player Error", str),
+        commands.MissingRequiredArgument: (
+            "Missing Argument", lambda error: f"Missing required argument: {error.param.name}"
+        ),
+        commands.BadArgument: ("Invalid Argument", str),
+    }
+    
     @staticmethod
     async def handle_command_error(ctx, error):
         """Handle command errors"""
-        if isinstance(error, ValidationError):
-            embed = create_error_embed("Invalid Input", str(error))
-            await ctx.send(embed=embed)
-        
-        elif isinstance(error, MatchError):
-            embed = create_error_embed("Match Error", str(error))
-            await ctx.send(embed=embed)
-        
-        elif isinstance(error, PlayerError):
-            embed = create_error_embed("Player Error", str(error))
-            await ctx.send(embed=embed)
-        
-        elif isinstance(error, commands.MissingRequiredArgument):
-            embed = create_error_embed(
-                "Missing Argument", 
-                f"Missing required argument: {error.param.name}"
-            )
-            await ctx.send(embed=embed)
-        
-        elif isinstance(error, commands.BadArgument):
-            embed = create_error_embed("Invalid Argument", str(error))
-            await ctx.send(embed=embed)
-        
-        elif isinstance(error, commands.CommandNotFound):
+        if isinstance(error, commands.CommandNotFound):
             # Silently ignore CommandNotFound errors to reduce spam
             return
         
-        elif isinstance(error, commands.CommandInvokeError):
-            # Unwrap the original error and handle it recursively
-            await ErrorHandler.handle_command_error(ctx, error.original)
-            return
+        # Exact type match covers the common errors with a single lookup
+        entry = ErrorHandler._HANDLERS.get(type(error))
+        if entry is None:
+            if isinstance(error, commands.CommandInvokeError):
+                # Unwrap the original error and handle it recursively
+                await ErrorHandler.handle_command_error(ctx, error.original)
+                return
+            
+            # Subclasses of the handled errors (e.g. MemberNotFound is a BadArgument)
+            for error_type, candidate in ErrorHandler._HANDLERS.items():
+                if isinstance(error, error_type):
+                    entry = candidate
+                    break
+        
+        if entry is not None:
+            title, describe = entry
+            await ctx.send(embed=create_error_embed(title, describe(error)))
         
         else:
             embed = create_error_embed(